@@ -1,11 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-import pyodbc
-import csv
+import bisect
+import os
+import sys
 import threading
 
-DELIMITER = "\t"
+from compact import compact_database
+from key_index import UPDATE_BATCH
+from loader import LoadError, connect, load_database
+from run_history import report_run, trends, format_run
+
+SCAN_BATCH = 50  # files per GUI update while scanning the folder
+
+DEDUPE_MODES = {
+    "Insert all rows": None,
+    "Skip existing keys": "skip",
+    "Update existing keys": "update",
+}
 
 
 class DBToolApp:
@@ -16,10 +28,14 @@ class DBToolApp:
         self.root.geometry("950x650")
 
         self.base_dir = Path.cwd()
+        self.scan_id = 0
 
         self.create_header()
         self.create_tabs()
 
+        # Scan once the window is up, folders on network shares can be slow
+        self.root.after_idle(self.refresh_all_lists)
+
     # ==============================
     # HEADER
     # ==============================
@@ -98,13 +114,73 @@ class DBToolApp:
         tab.scrollable_frame = scrollable_frame
         tab.check_vars = {}
 
+        # Empty Options
+        if mode == "empty":
+            tab.compact_var = tk.BooleanVar()
+            ttk.Checkbutton(
+                tab,
+                text="Compact after emptying",
+                variable=tab.compact_var
+            ).pack(anchor="w", padx=10, pady=(5, 0))
+
+        # Insert Options
+        if mode == "insert":
+            tab.verify_var = tk.BooleanVar()
+            ttk.Checkbutton(
+                tab,
+                text="Verify row counts and checksums after insert",
+                variable=tab.verify_var
+            ).pack(anchor="w", padx=10, pady=(5, 0))
+
+            tab.bulk_load_var = tk.BooleanVar()
+            ttk.Checkbutton(
+                tab,
+                text="Bulk load (drop secondary indexes, rebuild after)",
+                variable=tab.bulk_load_var
+            ).pack(anchor="w", padx=10)
+
+            dedupe_frame = ttk.Frame(tab)
+            dedupe_frame.pack(anchor="w", padx=10)
+
+            ttk.Label(dedupe_frame, text="Duplicate keys:").pack(side="left")
+
+            tab.dedupe_var = tk.StringVar(value="Insert all rows")
+            ttk.Combobox(
+                dedupe_frame,
+                textvariable=tab.dedupe_var,
+                values=list(DEDUPE_MODES),
+                state="readonly",
+                width=22
+            ).pack(side="left", padx=5)
+
         # Run Button
-        run_btn = ttk.Button(tab, text="RUN")
-        run_btn.pack(pady=10)
-        tab.run_btn = run_btn
+        button_frame = ttk.Frame(tab)
+        button_frame.pack(pady=10)
+
+        run_btn = ttk.Button(button_frame, text="RUN")
+        run_btn.pack(side="left", padx=5)
+        tab.buttons = [run_btn]
 
         run_btn.configure(command=lambda: self.start_thread(mode, tab))
 
+        # Compact on demand, without emptying
+        if mode == "empty":
+            compact_btn = ttk.Button(
+                button_frame,
+                text="COMPACT",
+                command=lambda: self.start_thread("compact", tab)
+            )
+            compact_btn.pack(side="left", padx=5)
+            tab.buttons.append(compact_btn)
+
+        # Throughput trends from the run history
+        if mode == "insert":
+            ttk.Button(
+                button_frame,
+                text="HISTORY",
+                command=lambda: self.show_history(tab)
+            ).pack(side="left", padx=5)
+
         # Progress Bar
         progress = ttk.Progressbar(tab, mode="determinate")
         progress.pack(fill="x", padx=10)
@@ -117,30 +193,71 @@ class DBToolApp:
         log_text.pack(fill="both", expand=True, padx=10, pady=5)
         tab.log_text = log_text
 
-        self.populate_file_list(tab)
-
     # ==============================
     # FILE LIST
     # ==============================
-    def populate_file_list(self, tab):
+    def clear_file_list(self, tab):
         for widget in tab.scrollable_frame.winfo_children():
             widget.destroy()
 
         tab.check_vars.clear()
+        tab.file_names = []
+        tab.file_widgets = []
+
+    def add_files(self, scan_id, files):
+        # Results of a scan for a folder we have since browsed away from
+        if scan_id != self.scan_id:
+            return
 
-        for file in sorted(self.base_dir.glob("*.accdb")):
-            var = tk.BooleanVar()
-            chk = ttk.Checkbutton(
-                tab.scrollable_frame,
-                text=file.name,
-                variable=var
+        for tab in (self.empty_tab, self.insert_tab):
+            for file in files:
+                var = tk.BooleanVar(value=tab.select_all_var.get())
+                chk = ttk.Checkbutton(
+                    tab.scrollable_frame,
+                    text=file.name,
+                    variable=var
+                )
+
+                # Keep the list sorted as batches stream in
+                index = bisect.bisect(tab.file_names, file.name)
+                if index < len(tab.file_widgets):
+                    chk.pack(anchor="w", before=tab.file_widgets[index])
+                else:
+                    chk.pack(anchor="w")
+
+                tab.file_names.insert(index, file.name)
+                tab.file_widgets.insert(index, chk)
+                tab.check_vars[file] = var
+
+    def scan_folder(self, scan_id, folder):
+        batch = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(".accdb") and entry.is_file():
+                        batch.append(Path(entry.path))
+
+                    if len(batch) >= SCAN_BATCH:
+                        self.root.after(0, lambda b=batch: self.add_files(scan_id, b))
+                        batch = []
+        except OSError as e:
+            # bind the text now: e is unset once the except block ends
+            self.root.after(
+                0, lambda msg=f"Cannot read folder:\n{e}": messagebox.showerror("Error", msg)
             )
-            chk.pack(anchor="w")
-            tab.check_vars[file] = var
+
+        self.root.after(0, lambda: self.add_files(scan_id, batch))
 
     def refresh_all_lists(self):
-        self.populate_file_list(self.empty_tab)
-        self.populate_file_list(self.insert_tab)
+        self.scan_id += 1
+        self.clear_file_list(self.empty_tab)
+        self.clear_file_list(self.insert_tab)
+
+        threading.Thread(
+            target=self.scan_folder,
+            args=(self.scan_id, self.base_dir),
+            daemon=True
+        ).start()
 
     def toggle_select_all(self, tab):
         state = tab.select_all_var.get()
@@ -152,20 +269,30 @@ class DBToolApp:
     # ==============================
     def start_thread(self, mode, tab):
 
-        selected_files = [file for file, var in tab.check_vars.items() if var.get()]
+        selected_files = sorted(file for file, var in tab.check_vars.items() if var.get())
 
         if not selected_files:
             messagebox.showwarning("Warning", "No database selected!")
             return
 
-        tab.run_btn.config(state="disabled")
+        for button in tab.buttons:
+            button.config(state="disabled")
         tab.progress["value"] = 0
         tab.progress["maximum"] = len(selected_files)
         tab.log_text.delete("1.0", tk.END)
 
+        # Read Tk variables here, not from the worker thread
+        options = {}
+        if mode == "empty":
+            options["compact"] = tab.compact_var.get()
+        if mode == "insert":
+            options["verify"] = tab.verify_var.get()
+            options["dedupe"] = DEDUPE_MODES[tab.dedupe_var.get()]
+            options["bulk_load"] = tab.bulk_load_var.get()
+
         thread = threading.Thread(
             target=self.run_action,
-            args=(mode, tab, selected_files),
+            args=(mode, tab, selected_files, options),
             daemon=True
         )
         thread.start()
@@ -173,30 +300,32 @@ class DBToolApp:
     # ==============================
     # RUN ACTION
     # ==============================
-    def run_action(self, mode, tab, selected_files):
+    def run_action(self, mode, tab, selected_files, options):
 
-        for index, db_path in enumerate(selected_files, start=1):
+        try:
+            for index, db_path in enumerate(selected_files, start=1):
 
-            if mode == "empty":
-                self.clear_database(db_path, tab)
-            else:
-                self.insert_database(db_path, tab)
+                if mode == "empty":
+                    self.clear_database(db_path, tab, options)
+                elif mode == "compact":
+                    self.compact_database(db_path, tab)
+                else:
+                    self.insert_database(db_path, tab, options)
 
-            self.root.after(0, lambda i=index: tab.progress.config(value=i))
+                self.root.after(0, lambda i=index: tab.progress.config(value=i))
 
-        self.root.after(0, lambda: tab.run_btn.config(state="normal"))
+        finally:
+            # never leave the buttons disabled, whatever escaped above
+            self.root.after(0, lambda: [button.config(state="normal") for button in tab.buttons])
 
     # ==============================
     # CLEAR DATABASE
     # ==============================
-    def clear_database(self, db_path, tab):
+    def clear_database(self, db_path, tab, options):
         self.log(tab, f"Clearing: {db_path.name}")
 
         try:
-            conn = pyodbc.connect(
-                r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
-                f"DBQ={db_path};"
-            )
+            conn = connect(db_path)
             cursor = conn.cursor()
 
             tables = [
@@ -213,82 +342,84 @@ class DBToolApp:
             cursor.close()
             conn.close()
 
+            if options.get("compact"):
+                compact_database(db_path, lambda message: self.log(tab, message))
+
             self.log(tab, "  SUCCESS\n")
 
         except Exception as e:
             self.log(tab, f"  ERROR: {e}\n")
 
     # ==============================
-    # INSERT DATABASE
+    # COMPACT DATABASE
     # ==============================
-    def insert_database(self, db_path, tab):
-
-        self.log(tab, f"Inserting into: {db_path.name}")
+    def compact_database(self, db_path, tab):
+        self.log(tab, f"Compacting: {db_path.name}")
 
         try:
-            conn = pyodbc.connect(
-                r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
-                f"DBQ={db_path};"
-            )
-            cursor = conn.cursor()
-            cursor.fast_executemany = True
-
-            tables = [
-                row.table_name
-                for row in cursor.tables(tableType="TABLE")
-                if not row.table_name.startswith("MSys")
-            ]
+            compact_database(db_path, lambda message: self.log(tab, message))
+            self.log(tab, "  SUCCESS\n")
 
-            if not tables:
-                self.log(tab, "  No user tables found\n")
-                return
+        except Exception as e:
+            self.log(tab, f"  ERROR: {e}\n")
 
-            tables.sort()
-            target_table = tables[0]
+    # ==============================
+    # INSERT DATABASE
+    # ==============================
+    def insert_database(self, db_path, tab, options):
 
-            cursor.execute(f"SELECT * FROM [{target_table}] WHERE 1=0")
-            col_count = len(cursor.description)
+        self.log(tab, f"Inserting into: {db_path.name}")
 
-            placeholders = ",".join("?" * col_count)
-            insert_sql = f"INSERT INTO [{target_table}] VALUES ({placeholders})"
+        config = dict(options, fast_executemany=True, update_batch=UPDATE_BATCH)
 
+        try:
             prefix = db_path.stem
             txt_files = sorted(self.base_dir.glob(f"{prefix}*.txt"))
 
-            inserted = 0
-            skipped = 0
+            result = load_database(db_path, txt_files, options, lambda message: self.log(tab, message))
+            if result is None:
+                self.log(tab, "")
+                return
 
-            for txt_file in txt_files:
-                with open(txt_file, newline="", encoding="utf-8") as f:
-                    reader = csv.reader(f, delimiter=DELIMITER)
+            report_run(db_path.name, txt_files, result, config, lambda message: self.log(tab, message))
 
-                    for row in reader:
+            if result["verified"] is False:
+                self.log(tab, "  DONE WITH VERIFY ERRORS\n")
+            else:
+                self.log(tab, "  SUCCESS\n")
 
-                        if not row or all(not c.strip() for c in row):
-                            skipped += 1
-                            continue
+        except LoadError as e:
+            report_run(db_path.name, txt_files, e.result, config, lambda message: self.log(tab, message))
+            self.log(tab, f"  ERROR: {e}\n")
 
-                        while len(row) > col_count and row[-1] == "":
-                            row.pop()
+        except Exception as e:
+            self.log(tab, f"  ERROR: {e}\n")
 
-                        if len(row) != col_count:
-                            skipped += 1
-                            continue
+    # ==============================
+    # RUN HISTORY
+    # ==============================
+    def show_history(self, tab):
+        selected = [file.name for file, var in tab.check_vars.items() if var.get()]
 
-                        row = [c.strip() if c.strip() else None for c in row]
+        runs = []
+        for name in selected or [None]:
+            runs.extend(trends(name))
 
-                        cursor.execute(insert_sql, row)
-                        inserted += 1
+        # Own window, so a run in progress keeps its log
+        window = tk.Toplevel(self.root)
+        window.title("Run History")
+        window.geometry("900x400")
 
-            conn.commit()
-            cursor.close()
-            conn.close()
+        history_text = tk.Text(window, wrap="none")
+        history_text.pack(fill="both", expand=True, padx=10, pady=10)
 
-            self.log(tab, f"  Inserted: {inserted}, Skipped: {skipped}")
-            self.log(tab, "  SUCCESS\n")
+        if not runs:
+            history_text.insert(tk.END, "No runs recorded yet\n")
 
-        except Exception as e:
-            self.log(tab, f"  ERROR: {e}\n")
+        for run in runs:
+            history_text.insert(tk.END, format_run(run) + "\n")
+
+        history_text.config(state="disabled")
 
     # ==============================
     # THREAD-SAFE LOG
@@ -306,4 +437,11 @@ class DBToolApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = DBToolApp(root)
-    root.mainloop()
+
+    # Used by bench_startup.py: report when the first frame is on screen
+    if "--startup-benchmark" in sys.argv:
+        root.wait_visibility()
+        print("READY", flush=True)
+        root.destroy()
+    else:
+        root.mainloop()
@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-import pyodbc
 import csv
+import sys
+
+from sap_txt import detect_encoding, open_txt
 
 # ==============================
 # CONFIG
@@ -10,6 +12,19 @@ import csv
 DELIMITER = "\t"
 
 
+# ==============================
+# DB CONNECTION
+# ==============================
+def connect(db_path):
+    # Imported on first use: loading the ODBC driver manager slows startup
+    import pyodbc
+
+    return pyodbc.connect(
+        r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
+        f"DBQ={db_path};"
+    )
+
+
 # ==============================
 # MAIN GUI CLASS
 # ==============================
@@ -162,10 +177,7 @@ class DBToolApp:
         self.log(tab, f"Clearing: {db_path.name}")
 
         try:
-            conn = pyodbc.connect(
-                r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
-                f"DBQ={db_path};"
-            )
+            conn = connect(db_path)
             cursor = conn.cursor()
 
             tables = [
@@ -195,10 +207,7 @@ class DBToolApp:
         self.log(tab, f"Inserting into: {db_path.name}")
 
         try:
-            conn = pyodbc.connect(
-                r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
-                f"DBQ={db_path};"
-            )
+            conn = connect(db_path)
             cursor = conn.cursor()
             cursor.fast_executemany = True
 
@@ -228,7 +237,10 @@ class DBToolApp:
             skipped = 0
 
             for txt_file in txt_files:
-                with open(txt_file, newline="", encoding="utf-8") as f:
+                encoding = detect_encoding(txt_file)
+                self.log(tab, f"  {txt_file.name} ({encoding})")
+
+                with open_txt(txt_file, encoding) as f:
                     reader = csv.reader(f, delimiter=DELIMITER)
 
                     for row in reader:
@@ -273,4 +285,11 @@ class DBToolApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = DBToolApp(root)
-    root.mainloop()
+
+    # Used by bench_startup.py: report when the first frame is on screen
+    if "--startup-benchmark" in sys.argv:
+        root.wait_visibility()
+        print("READY", flush=True)
+        root.destroy()
+    else:
+        root.mainloop()
@@ -1,13 +1,22 @@
-import pyodbc
-import csv
 from pathlib import Path
 
+from key_index import UPDATE_BATCH
+from loader import LoadError, load_database
+from run_history import report_run
+
 # ==============================
 # CONFIG
 # ==============================
 BASE_DIR = Path(r"C:\\Users\\PranayHarishchandra\\Desktop\\s_workspace\\test")
-DELIMITER = "\t"
 SKIP_DBS = {"database.accdb"}  # lower-case
+VERIFY = False  # compare row counts / checksums after commit
+DEDUPE = None  # None, "skip" or "update" rows whose key already exists
+BULK_LOAD = False  # drop secondary indexes during the load, rebuild after
+
+OPTIONS = {"verify": VERIFY, "dedupe": DEDUPE, "bulk_load": BULK_LOAD}
+HISTORY_CONFIG = dict(OPTIONS, fast_executemany=True, update_batch=UPDATE_BATCH)
+
+verify_failed = []
 
 # ==============================
 # MAIN LOOP
@@ -31,78 +40,27 @@ for accdb_path in BASE_DIR.glob("*.accdb"):
     print(f"TXT files: {[f.name for f in txt_files]}")
 
     # ==============================
-    # CONNECT TO ACCESS
-    # ==============================
-    conn = pyodbc.connect(
-        r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
-        rf"DBQ={accdb_path};"
-    )
-    cursor = conn.cursor()
-    cursor.fast_executemany = True
-
-    # ==============================
-    # FIND FIRST USER TABLE
+    # LOAD INTO FIRST USER TABLE
     # ==============================
-    tables = [
-        row.table_name
-        for row in cursor.tables(tableType="TABLE")
-        if not row.table_name.startswith("MSys")
-    ]
-
-    if not tables:
-        print("No user tables found, skipping DB")
-        cursor.close()
-        conn.close()
+    try:
+        result = load_database(accdb_path, txt_files, OPTIONS)
+    except LoadError as e:
+        # keep the failed attempt in the history, then stop as before
+        report_run(accdb_path.name, txt_files, e.result, HISTORY_CONFIG)
+        raise
+
+    if result is None:
         continue
 
-    tables.sort()
-    target_table = tables[0]
-    print(f"Target table: {target_table}")
-
     # ==============================
-    # GET COLUMN COUNT
+    # RUN HISTORY
     # ==============================
-    cursor.execute(f"SELECT * FROM [{target_table}] WHERE 1=0")
-    col_count = len(cursor.description)
-
-    placeholders = ",".join("?" * col_count)
-    insert_sql = f"INSERT INTO [{target_table}] VALUES ({placeholders})"
-
-    inserted = 0
-    skipped = 0
-
-    # ==============================
-    # PROCESS ALL TXT FILES
-    # ==============================
-    for txt_file in txt_files:
-        print(f"  Importing {txt_file.name}")
-
-        with open(txt_file, newline="", encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter=DELIMITER)
-
-            for line_no, row in enumerate(reader, start=1):
-
-                if not row or all(not c.strip() for c in row):
-                    skipped += 1
-                    continue
-
-                # Remove trailing empty SAP column
-                while len(row) > col_count and row[-1] == "":
-                    row.pop()
-
-                if len(row) != col_count:
-                    skipped += 1
-                    continue
-
-                row = [c.strip() if c.strip() else None for c in row]
-
-                cursor.execute(insert_sql, row)
-                inserted += 1
-
-    conn.commit()
-    cursor.close()
-    conn.close()
+    report_run(accdb_path.name, txt_files, result, HISTORY_CONFIG)
 
-    print(f"Inserted: {inserted}, Skipped: {skipped}")
+    if result["verified"] is False:
+        verify_failed.append(accdb_path.name)
 
-print("\n✅ ALL DATABASES PROCESSED SUCCESSFULLY")
\ No newline at end of file
+if verify_failed:
+    print(f"\n❌ VERIFY FAILED FOR: {', '.join(verify_failed)}")
+else:
+    print("\n✅ ALL DATABASES PROCESSED SUCCESSFULLY")
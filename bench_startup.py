@@ -0,0 +1,49 @@
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# ==============================
+# CONFIG
+# ==============================
+SCRIPTS = ["GUI_optimized.py", "GUI_unoptimized.py"]
+RUNS = 5
+TIMEOUT = 60
+
+
+def time_startup(script: Path, folder: Path):
+    """Seconds from process launch until the script's window is visible."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(script), "--startup-benchmark"],
+        cwd=folder,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        for line in proc.stdout:
+            if line.strip() == "READY":
+                return time.perf_counter() - start
+    finally:
+        proc.wait(timeout=TIMEOUT)
+
+    raise RuntimeError(f"{script.name} exited without showing a window")
+
+
+def main():
+    # Folder the GUIs start in, e.g. a network share with many files
+    folder = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    here = Path(__file__).resolve().parent
+
+    print(f"Cold start in {folder} ({RUNS} runs each)\n")
+    for name in SCRIPTS:
+        times = [time_startup(here / name, folder) for _ in range(RUNS)]
+        print(
+            f"{name:<22} min {min(times):.3f}s  "
+            f"median {statistics.median(times):.3f}s  max {max(times):.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import ctypes
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# ==============================
+# CONFIG
+# ==============================
+ACCESS_DRIVER = "Microsoft Access Driver (*.mdb, *.accdb)"
+ACCESS_SUFFIXES = {".accdb", ".mdb"}
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+ODBC_ADD_DSN = 1
+
+
+# ==============================
+# BACKENDS
+# ==============================
+def _compact_access(src: Path, dst: Path):
+    """Compact an Access file into dst via the ODBC installer's COMPACT_DB."""
+    if sys.platform != "win32":
+        raise RuntimeError("Access compaction needs the Windows ODBC installer")
+
+    odbccp32 = ctypes.windll.ODBCCP32
+    config = odbccp32.SQLConfigDataSourceW
+    # BOOL SQLConfigDataSourceW(HWND, WORD, LPCWSTR driver, LPCWSTR attributes)
+    config.argtypes = [ctypes.c_void_p, ctypes.c_ushort, ctypes.c_wchar_p, ctypes.c_wchar_p]
+    config.restype = ctypes.c_int
+
+    # a NUL-separated list ending in a double NUL, so it has to go in a
+    # buffer: ctypes cuts a str with embedded NULs short or rejects it
+    attributes = ctypes.create_unicode_buffer(f'COMPACT_DB="{src}" "{dst}" General\0\0')
+
+    if not config(None, ODBC_ADD_DSN, ACCESS_DRIVER, attributes):
+        code = ctypes.c_ulong()
+        message = ctypes.create_unicode_buffer(512)
+        odbccp32.SQLInstallerErrorW(1, ctypes.byref(code), message, len(message), None)
+        raise RuntimeError(f"COMPACT_DB failed: {message.value or code.value}")
+
+
+def _compact_sqlite(src: Path, dst: Path):
+    """Local stand-in for Access: VACUUM INTO writes the compacted copy."""
+    conn = sqlite3.connect(src)
+    try:
+        conn.execute("VACUUM INTO ?", (str(dst),))
+    finally:
+        conn.close()
+
+
+def _backend(db_path: Path):
+    suffix = db_path.suffix.lower()
+    if suffix in ACCESS_SUFFIXES:
+        return _compact_access
+    if suffix in SQLITE_SUFFIXES:
+        return _compact_sqlite
+    raise ValueError(f"Don't know how to compact {db_path.name}")
+
+
+# ==============================
+# COMPACT
+# ==============================
+def compact_database(db_path: Path, log=print):
+    """Compact db_path in place and return (size_before, size_after) in bytes.
+
+    The compacted copy is written next to the original and swapped in with
+    os.replace, so a failure leaves the original untouched. The database
+    must not be open anywhere, including our own connections.
+    """
+    db_path = Path(db_path)
+    compact = _backend(db_path)
+
+    tmp_path = db_path.with_name(f"~compact_{db_path.name}")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    before = db_path.stat().st_size
+    try:
+        compact(db_path, tmp_path)
+        os.replace(tmp_path, db_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    after = db_path.stat().st_size
+
+    log(f"  Compacted: {before / 1048576:.1f} MB -> {after / 1048576:.1f} MB")
+    return before, after
@@ -3,6 +3,11 @@ import os
 from pathlib import Path
 import pyodbc
 
+from compact import compact_database
+
+# pooled connections keep the file open after close(), which blocks compaction
+pyodbc.pooling = False
+
 
 # this is correct
 def find_accdb_files(directory: Path):
@@ -14,7 +19,10 @@ def find_accdb_files(directory: Path):
 
 
 def clear_database(db_path: Path):
-    """Connect to Access DB at db_path and delete all rows from user tables."""
+    """Connect to Access DB at db_path and delete all rows from user tables.
+
+    Returns True if the database was cleared (or had nothing to clear).
+    """
     print(f"\nClearing database: {db_path.name}")
     conn = None
     cursor = None
@@ -37,7 +45,7 @@ def clear_database(db_path: Path):
 
         if not tables:
             print("  No user tables found.")
-            return
+            return True
 
         for table in tables:
             print(f"  Deleting data from table: {table}")
@@ -45,6 +53,7 @@ def clear_database(db_path: Path):
 
         conn.commit()
         print("  Done: all user tables cleared.")
+        return True
 
     except Exception as e:
         print(f"  Error while clearing {db_path.name}: {e}")
@@ -106,8 +115,18 @@ def main():
         print("Confirmation not received. Aborting.")
         return
 
+    try:
+        compact = input("Compact after clearing? (y/N): ").strip().lower() == "y"
+    except (EOFError, KeyboardInterrupt):
+        print("\nInput cancelled.")
+        return
+
     for db in targets:
-        clear_database(db)
+        if clear_database(db) and compact:
+            try:
+                compact_database(db)
+            except Exception as e:
+                print(f"  Error while compacting {db.name}: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+import json
+import os
+import time
+from pathlib import Path
+
+
+# ==============================
+# INDEX DEFINITIONS
+# ==============================
+def secondary_indexes(cursor, table):
+    """Return {index_name: [(column, "A"|"D"), ...]} for the non-unique indexes of table.
+
+    Unique indexes (the primary key among them) are left out on purpose:
+    they enforce constraints, and rebuilding one after a load that broke
+    it would fail and leave the table without it.
+    """
+    indexes = {}
+    for row in cursor.statistics(table):
+        if row.index_name is None or row.column_name is None or not row.non_unique:
+            continue
+        indexes.setdefault(row.index_name, []).append(
+            (row.ordinal_position, row.column_name, row.asc_or_desc or "A")
+        )
+
+    return {
+        name: [(column, order) for _, column, order in sorted(columns)]
+        for name, columns in indexes.items()
+    }
+
+
+def create_index_sql(table, name, columns):
+    parts = ", ".join(
+        f"[{column}] {'DESC' if order == 'D' else 'ASC'}" for column, order in columns
+    )
+    return f"CREATE INDEX [{name}] ON [{table}] ({parts})"
+
+
+# ==============================
+# SIDECAR
+# ==============================
+def sidecar_path(db_path):
+    """File next to the database that holds dropped index definitions."""
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.name + ".indexes.json")
+
+
+def _write_sidecar(sidecar, table, indexes):
+    if not indexes:
+        if sidecar.exists():
+            sidecar.unlink()
+        return
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    tmp.write_text(json.dumps({"table": table, "indexes": indexes}, indent=2))
+    os.replace(tmp, sidecar)
+
+
+def _rollback(conn):
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+
+
+def restore_pending_indexes(conn, sidecar, log):
+    """Rebuild indexes a killed run dropped but never put back.
+
+    Never raises: a sidecar that can't be read or no longer matches the
+    database is logged and kept for manual repair, and the load goes on.
+    """
+    if not sidecar.exists():
+        return
+
+    try:
+        pending = json.loads(sidecar.read_text())
+        table = pending["table"]
+
+        # a run killed while dropping may not have got to all of them
+        cursor = conn.cursor()
+        try:
+            present = set(secondary_indexes(cursor, table))
+        finally:
+            cursor.close()
+        indexes = {
+            name: [tuple(column) for column in columns]
+            for name, columns in pending["indexes"].items()
+            if name not in present
+        }
+    except Exception as e:
+        log(f"  Could not restore indexes from {sidecar.name}: {e}")
+        log(f"  Kept {sidecar.name} for manual repair, bulk load stays off until it is gone")
+        return
+
+    log(f"  Restoring {len(indexes)} index(es) left dropped by an interrupted run")
+    rebuild_indexes(conn, table, indexes, log, sidecar)
+
+
+# ==============================
+# DROP / REBUILD
+# ==============================
+def drop_indexes(conn, table, indexes, log, sidecar=None):
+    """Drop the given indexes and return the ones actually dropped.
+
+    Indexes Access refuses to drop (e.g. ones backing a relationship) are
+    logged and kept. With a sidecar path the definitions are written there
+    before anything is dropped, so a killed run can be repaired later.
+    Nothing is dropped while the sidecar still lists indexes an earlier
+    run could not restore, as writing it would lose their definitions.
+    """
+    if sidecar is not None and sidecar.exists():
+        log(f"  Indexes kept: {sidecar.name} still lists indexes to restore")
+        return {}
+
+    start = time.perf_counter()
+    if sidecar is not None:
+        _write_sidecar(sidecar, table, indexes)
+
+    cursor = conn.cursor()
+    dropped = {}
+
+    for name, columns in indexes.items():
+        try:
+            cursor.execute(f"DROP INDEX [{name}] ON [{table}]")
+            conn.commit()
+            dropped[name] = columns
+        except Exception as e:
+            _rollback(conn)
+            log(f"  Kept index {name}: {e}")
+
+    cursor.close()
+    if sidecar is not None:
+        _write_sidecar(sidecar, table, dropped)
+
+    log(f"  Dropped {len(dropped)} index(es) in {time.perf_counter() - start:.2f}s")
+    return dropped
+
+
+def drop_secondary_indexes(conn, table, log, sidecar=None):
+    """Drop every secondary index of table ahead of a bulk load."""
+    cursor = conn.cursor()
+    indexes = secondary_indexes(cursor, table)
+    cursor.close()
+    return drop_indexes(conn, table, indexes, log, sidecar)
+
+
+def restore_after_failure(conn, table, dropped, log, sidecar=None):
+    """Roll back a failed load, then put its dropped indexes back."""
+    _rollback(conn)
+    rebuild_indexes(conn, table, dropped, log, sidecar)
+
+
+def rebuild_indexes(conn, table, indexes, log, sidecar=None):
+    """Recreate dropped indexes. Never raises, so it is safe on the error path.
+
+    The sidecar, if given, is left holding only the indexes that failed.
+    """
+    start = time.perf_counter()
+    failed = {}
+
+    try:
+        cursor = conn.cursor()
+    except Exception as e:
+        log(f"  FAILED to rebuild indexes: {e}")
+        failed = dict(indexes)
+        cursor = None
+
+    if cursor is not None:
+        for name, columns in indexes.items():
+            try:
+                cursor.execute(create_index_sql(table, name, columns))
+                conn.commit()
+            except Exception as e:
+                _rollback(conn)
+                failed[name] = columns
+                log(f"  FAILED to rebuild index {name}: {e}")
+                log(f"    {create_index_sql(table, name, columns)}")
+
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+    if sidecar is not None:
+        try:
+            _write_sidecar(sidecar, table, failed)
+        except OSError as e:
+            log(f"  Could not update {sidecar.name}: {e}")
+
+    log(
+        f"  Rebuilt {len(indexes) - len(failed)}/{len(indexes)} index(es) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    if failed and sidecar is not None:
+        log(f"  Definitions kept in {sidecar.name}, the next load retries them")
+    return list(failed)
@@ -0,0 +1,236 @@
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from hashlib import blake2b
+
+# ==============================
+# CONFIG
+# ==============================
+NUMERIC_TYPES = (int, float, Decimal)
+DATE_TYPES = (datetime, date)
+DATE_FORMATS = ("%Y%m%d", "%d.%m.%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d.%m.%Y %H:%M:%S")
+FETCH_SIZE = 10000
+UPDATE_BATCH = 1000
+
+NEW = "new"
+DUPLICATE = "duplicate"
+EXISTING = "existing"
+
+IN_TABLE = 0
+SEEN = 1
+
+
+# ==============================
+# KEY COLUMNS
+# ==============================
+def primary_key_columns(cursor, table):
+    """Return the key column names of table, in index order.
+
+    The Access ODBC driver does not implement SQLPrimaryKeys, so the key is
+    read from the unique indexes instead: "PrimaryKey" if present (the
+    name Access gives it), otherwise the first unique index.
+    """
+    indexes = {}
+    for row in cursor.statistics(table, unique=True):
+        if row.index_name is None or row.column_name is None:
+            continue
+        indexes.setdefault(row.index_name, []).append((row.ordinal_position, row.column_name))
+
+    if not indexes:
+        return []
+
+    name = "PrimaryKey" if "PrimaryKey" in indexes else sorted(indexes)[0]
+    return [column for _, column in sorted(indexes[name])]
+
+
+# ==============================
+# KEY INDEX
+# ==============================
+class KeyIndex:
+    """Compact in-memory index of the keys in a table and seen in the load.
+
+    Keys are normalised so file strings compare equal to what the driver
+    returns: text is case-folded (Access compares text case-insensitively),
+    numbers go through Decimal and dates are parsed from the SAP formats.
+    Each key is then stored as an 8-byte blake2b digest in a single dict
+    whose value records whether the load has reached it yet. At 10 million
+    keys the chance of any two digests colliding is about 1 in 400,000.
+
+    Raises ValueError for key columns of a type it cannot match reliably.
+    """
+
+    def __init__(self, description, key_columns):
+        names = [col[0].lower() for col in description]
+        self.key_columns = key_columns
+        self.positions = [names.index(k.lower()) for k in key_columns]
+        self.kinds = []
+        for i in self.positions:
+            if description[i][1] is str:
+                self.kinds.append("text")
+            elif description[i][1] in NUMERIC_TYPES:
+                self.kinds.append("number")
+            elif description[i][1] in DATE_TYPES:
+                self.kinds.append("date")
+            else:
+                raise ValueError(
+                    f"key column [{description[i][0]}] has type "
+                    f"{getattr(description[i][1], '__name__', description[i][1])}, "
+                    f"which can't be matched against file values"
+                )
+
+        # digest -> IN_TABLE (not reached yet) or SEEN (reached in this load)
+        self.keys = {}
+
+    def _normalize(self, value, kind):
+        if value is None:
+            return "\x00"
+        if kind == "text":
+            return str(value).casefold()
+        if kind == "number":
+            try:
+                return str(Decimal(str(value)).normalize())
+            except InvalidOperation:
+                return str(value)
+        if kind == "date":
+            if isinstance(value, str):
+                for fmt in DATE_FORMATS:
+                    try:
+                        value = datetime.strptime(value, fmt)
+                        break
+                    except ValueError:
+                        continue
+                else:
+                    return value
+            if isinstance(value, datetime) and value.time() != time():
+                return value.isoformat(" ")
+            return value.strftime("%Y-%m-%d")
+        return str(value)
+
+    def key(self, row):
+        text = "\x1f".join(
+            self._normalize(row[i], kind)
+            for i, kind in zip(self.positions, self.kinds)
+        )
+        return blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+    def load(self, cursor, table):
+        """Read every existing key from table once."""
+        columns = ",".join(f"[{k}]" for k in self.key_columns)
+        cursor.execute(f"SELECT {columns} FROM [{table}]")
+
+        # key() indexes into a full row, so map key values back to positions
+        width = max(self.positions) + 1
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for values in rows:
+                row = [None] * width
+                for i, value in zip(self.positions, values):
+                    row[i] = value
+                self.keys[self.key(row)] = IN_TABLE
+
+        return len(self.keys)
+
+    def check(self, row):
+        """Classify a row as NEW, DUPLICATE (earlier in this load) or EXISTING."""
+        key = self.key(row)
+        state = self.keys.get(key)
+        if state == SEEN:
+            return DUPLICATE
+        self.keys[key] = SEEN
+        if state == IN_TABLE:
+            return EXISTING
+        return NEW
+
+
+def update_statement(table, columns, key_columns):
+    """Return (sql, param_order) for updating a row by its key.
+
+    param_order lists the row positions to pass, SET columns first then
+    the WHERE keys. sql is None when every column is part of the key.
+    """
+    lowered = [k.lower() for k in key_columns]
+    set_positions = [i for i, c in enumerate(columns) if c.lower() not in lowered]
+    key_positions = [[c.lower() for c in columns].index(k) for k in lowered]
+
+    if not set_positions:
+        return None, []
+
+    assignments = ", ".join(f"[{columns[i]}]=?" for i in set_positions)
+    conditions = " AND ".join(f"[{columns[i]}]=?" for i in key_positions)
+    sql = f"UPDATE [{table}] SET {assignments} WHERE {conditions}"
+    return sql, set_positions + key_positions
+
+
+# ==============================
+# DEDUPE
+# ==============================
+class Deduper:
+    """Applies a dedupe mode ("skip" or "update") to the rows of one load.
+
+    accept() tells whether a row should be inserted. Rows whose key is
+    already in the table are skipped, or queued as updates in "update"
+    mode; flush() sends whatever is still queued before the commit.
+    """
+
+    def __init__(self, cursor, table, description, mode, log):
+        self.cursor = cursor
+        self.keys = None
+        self.update_sql = None
+        self.update_order = []
+        self.pending_updates = []
+        self.duplicates = 0
+        self.existing_skipped = 0
+        self.updated = 0
+
+        key_columns = primary_key_columns(cursor, table)
+        if not key_columns:
+            log("  No primary key found, inserting all rows")
+            return
+
+        try:
+            self.keys = KeyIndex(description, key_columns)
+        except ValueError as e:
+            log(f"  Dedupe disabled: {e}")
+            return
+
+        existing = self.keys.load(cursor, table)
+        log(f"  Key {key_columns}: {existing} existing keys loaded")
+
+        if mode == "update":
+            columns = [col[0] for col in description]
+            self.update_sql, self.update_order = update_statement(table, columns, key_columns)
+
+    @property
+    def skipped(self):
+        return self.duplicates + self.existing_skipped
+
+    def accept(self, row):
+        if self.keys is None:
+            return True
+
+        status = self.keys.check(row)
+        if status == EXISTING:
+            if self.update_sql is None:
+                self.existing_skipped += 1
+            else:
+                self.pending_updates.append([row[i] for i in self.update_order])
+                if len(self.pending_updates) >= UPDATE_BATCH:
+                    self.flush()
+            return False
+        if status != NEW:
+            self.duplicates += 1
+            return False
+        return True
+
+    def flush(self):
+        if self.pending_updates:
+            self.cursor.executemany(self.update_sql, self.pending_updates)
+            self.updated += len(self.pending_updates)
+            self.pending_updates.clear()
+
+    def summary(self):
+        return (
+            f"Duplicates dropped: {self.duplicates}, "
+            f"Existing skipped: {self.existing_skipped}, Updated: {self.updated}"
+        )
@@ -0,0 +1,204 @@
+import csv
+import time
+
+from sap_txt import detect_encoding, open_txt
+from key_index import Deduper
+from indexes import (
+    drop_secondary_indexes, rebuild_indexes, restore_after_failure,
+    restore_pending_indexes, sidecar_path
+)
+from verify import LoadChecksum
+
+# ==============================
+# CONFIG
+# ==============================
+DELIMITER = "\t"
+
+
+# ==============================
+# DB CONNECTION
+# ==============================
+def connect(db_path):
+    # Imported on first use: loading the ODBC driver manager slows startup
+    import pyodbc
+
+    # a pooled connection keeps the .accdb open after close(), and then
+    # compaction can't replace the file; must be set before connecting
+    pyodbc.pooling = False
+
+    return pyodbc.connect(
+        r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
+        f"DBQ={db_path};"
+    )
+
+
+# ==============================
+# LOAD ONE DATABASE
+# ==============================
+class LoadError(Exception):
+    """A load that failed; result holds the counts and timings up to the failure."""
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+def load_database(db_path, txt_files, options, log=print):
+    """Insert the rows of txt_files into the first user table of db_path.
+
+    options may set "verify", "dedupe" (None, "skip" or "update") and
+    "bulk_load". Progress goes to log. Returns a dict with the counts and
+    per-phase timings, or None if the database has no user table. Errors
+    are raised as LoadError, with the same dict in its result, after any
+    dropped indexes have been put back. "verified" in the result is None
+    when verification was off, else whether it passed.
+    """
+    dropped = {}
+    sidecar = sidecar_path(db_path)
+    started_at = time.time()
+    timings = {}
+
+    conn = None
+    deduper = None
+    inserted = 0
+    skipped = 0
+    load_start = None
+
+    try:
+        conn = connect(db_path)
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+
+        restore_pending_indexes(conn, sidecar, log)
+
+        tables = [
+            row.table_name
+            for row in cursor.tables(tableType="TABLE")
+            if not row.table_name.startswith("MSys")
+        ]
+
+        if not tables:
+            log("  No user tables found")
+            return None
+
+        tables.sort()
+        target_table = tables[0]
+        log(f"  Target table: {target_table}")
+
+        cursor.execute(f"SELECT * FROM [{target_table}] WHERE 1=0")
+        description = cursor.description
+        col_count = len(description)
+
+        if options.get("dedupe"):
+            phase_start = time.perf_counter()
+            deduper = Deduper(cursor, target_table, description, options["dedupe"], log)
+            timings["keys"] = time.perf_counter() - phase_start
+
+        checksum = None
+        verified = None
+        if options.get("verify"):
+            phase_start = time.perf_counter()
+            checksum = LoadChecksum(description)
+            checksum.begin(cursor, target_table)
+            timings["verify"] = time.perf_counter() - phase_start
+
+        placeholders = ",".join("?" * col_count)
+        insert_sql = f"INSERT INTO [{target_table}] VALUES ({placeholders})"
+
+        if options.get("bulk_load"):
+            phase_start = time.perf_counter()
+            dropped = drop_secondary_indexes(conn, target_table, log, sidecar)
+            timings["drop"] = time.perf_counter() - phase_start
+
+        load_start = time.perf_counter()
+
+        for txt_file in txt_files:
+            encoding = detect_encoding(txt_file)
+            log(f"  {txt_file.name} ({encoding})")
+
+            with open_txt(txt_file, encoding) as f:
+                reader = csv.reader(f, delimiter=DELIMITER)
+
+                for row in reader:
+
+                    if not row or all(not c.strip() for c in row):
+                        skipped += 1
+                        continue
+
+                    # Remove trailing empty SAP column
+                    while len(row) > col_count and row[-1] == "":
+                        row.pop()
+
+                    if len(row) != col_count:
+                        skipped += 1
+                        continue
+
+                    row = [c.strip() if c.strip() else None for c in row]
+
+                    if deduper is not None and not deduper.accept(row):
+                        continue
+
+                    cursor.execute(insert_sql, row)
+                    inserted += 1
+
+                    if checksum is not None:
+                        checksum.add(row)
+
+        if deduper is not None:
+            deduper.flush()
+
+        conn.commit()
+
+        log(f"  Inserted: {inserted}, Skipped: {skipped}")
+        timings["load"] = time.perf_counter() - load_start
+        log(f"  Load time: {timings['load']:.2f}s")
+
+        updated = 0
+        if deduper is not None:
+            updated = deduper.updated
+            if deduper.keys is not None:
+                log(f"  {deduper.summary()}")
+
+        if checksum is not None:
+            phase_start = time.perf_counter()
+            verified = not checksum.finish(cursor, target_table, log, rows_only=updated > 0)
+            timings["verify"] += time.perf_counter() - phase_start
+
+        if dropped:
+            phase_start = time.perf_counter()
+            rebuild_indexes(conn, target_table, dropped, log, sidecar)
+            timings["rebuild"] = time.perf_counter() - phase_start
+            dropped = {}
+
+    except Exception as e:
+        # Put the indexes back even though the load failed
+        if dropped:
+            restore_after_failure(conn, target_table, dropped, log, sidecar)
+
+        if load_start is not None and "load" not in timings:
+            timings["load"] = time.perf_counter() - load_start
+        raise LoadError(str(e), {
+            "started_at": started_at,
+            "inserted": inserted,
+            "skipped": skipped + (deduper.skipped if deduper is not None else 0),
+            "timings": timings,
+            "verified": None,
+            "error": str(e),
+        }) from e
+
+    finally:
+        # a dead connection must not hide the original error
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    return {
+        "started_at": started_at,
+        "inserted": inserted,
+        "skipped": skipped + (deduper.skipped if deduper is not None else 0),
+        "timings": timings,
+        "verified": verified,
+        "error": None,
+    }
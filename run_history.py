@@ -0,0 +1,203 @@
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# ==============================
+# CONFIG
+# ==============================
+HISTORY_DB = Path.home() / ".accdb_run_history.sqlite3"
+BASELINE_RUNS = 10  # rolling window per database
+MIN_BASELINE_RUNS = 3
+REGRESSION_RATIO = 0.5  # flag runs slower than half the baseline rows/sec
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    database TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    inserted INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    rows_per_sec REAL NOT NULL,
+    timings TEXT NOT NULL,
+    config TEXT NOT NULL,
+    flagged INTEGER NOT NULL,
+    verified INTEGER,
+    status TEXT NOT NULL DEFAULT 'ok',
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_database ON runs (database, started_at);
+"""
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+
+    # history files written before verify results were recorded
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(runs)")]
+    if "verified" not in columns:
+        conn.execute("ALTER TABLE runs ADD COLUMN verified INTEGER")
+    # ... and before failed runs were
+    if "status" not in columns:
+        conn.execute("ALTER TABLE runs ADD COLUMN status TEXT NOT NULL DEFAULT 'ok'")
+        conn.execute("ALTER TABLE runs ADD COLUMN error TEXT")
+    return conn
+
+
+# ==============================
+# RECORD
+# ==============================
+def record_run(database, files, bytes_read, inserted, skipped, timings, config,
+               started_at=None, verified=None, error=None, path=HISTORY_DB):
+    """Append one insert run and return (rows_per_sec, baseline, flagged).
+
+    rows_per_sec only counts the load phase: key loading, verification and
+    index drop/rebuild scale with the table or the options, not the rows.
+    baseline is the mean rows/sec of the previous BASELINE_RUNS runs of the
+    same database with the same config, or None until MIN_BASELINE_RUNS of
+    them exist. verified is None when the run was not verified, else
+    whether it passed. A run with an error is stored as failed, with the
+    counts it reached; it is never flagged and never part of a baseline.
+    """
+    seconds = sum(timings.values())
+    load_seconds = timings.get("load", seconds)
+    rows_per_sec = inserted / load_seconds if load_seconds > 0 else 0.0
+    config = json.dumps(config, sort_keys=True)
+    status = "ok" if error is None else "failed"
+
+    conn = _connect(path)
+    try:
+        previous = [
+            row[0]
+            for row in conn.execute(
+                "SELECT rows_per_sec FROM runs WHERE database = ? AND config = ? AND inserted > 0 "
+                "AND status = 'ok' ORDER BY started_at DESC LIMIT ?",
+                (database, config, BASELINE_RUNS),
+            )
+        ]
+        baseline = sum(previous) / len(previous) if len(previous) >= MIN_BASELINE_RUNS else None
+        flagged = (
+            status == "ok" and baseline is not None and inserted > 0
+            and rows_per_sec < baseline * REGRESSION_RATIO
+        )
+
+        conn.execute(
+            "INSERT INTO runs (started_at, database, files, bytes, inserted, skipped, seconds, "
+            "rows_per_sec, timings, config, flagged, verified, status, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                started_at or time.time(), database, files, bytes_read, inserted, skipped,
+                seconds, rows_per_sec, json.dumps(timings), config, int(flagged),
+                None if verified is None else int(verified), status, error,
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return rows_per_sec, baseline, flagged
+
+
+def report_run(database, txt_files, result, config, log=print):
+    """Record a load_database result and log its throughput.
+
+    Failed loads are recorded too, from the result of their LoadError.
+    Never raises: a locked or read-only history file must not stop the
+    remaining databases.
+    """
+    try:
+        rows_per_sec, baseline, flagged = record_run(
+            database,
+            len(txt_files),
+            sum(f.stat().st_size for f in txt_files),
+            result["inserted"],
+            result["skipped"],
+            result["timings"],
+            config,
+            started_at=result["started_at"],
+            verified=result["verified"],
+            error=result.get("error"),
+        )
+    except Exception as e:
+        log(f"  History not recorded: {e}")
+        return
+
+    if result.get("error") is not None:
+        return
+
+    if baseline is None:
+        log(f"  Throughput: {rows_per_sec:.0f} rows/s")
+    else:
+        log(f"  Throughput: {rows_per_sec:.0f} rows/s (baseline {baseline:.0f})")
+    if flagged:
+        log("  WARNING: much slower than this database's recent runs")
+
+
+# ==============================
+# QUERY
+# ==============================
+def trends(database=None, limit=20, path=HISTORY_DB):
+    """Return the latest runs (newest first) as dicts, optionally for one database."""
+    if not Path(path).exists():
+        return []
+
+    conn = _connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        if database is None:
+            rows = conn.execute(
+                "SELECT * FROM runs ORDER BY started_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM runs WHERE database = ? ORDER BY started_at DESC LIMIT ?",
+                (database, limit),
+            ).fetchall()
+    finally:
+        conn.close()
+
+    runs = []
+    for row in rows:
+        run = dict(row)
+        run["timings"] = json.loads(run["timings"])
+        run["config"] = json.loads(run["config"])
+        run["flagged"] = bool(run["flagged"])
+        if run["verified"] is not None:
+            run["verified"] = bool(run["verified"])
+        runs.append(run)
+    return runs
+
+
+def format_run(run):
+    started = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["started_at"]))
+    flag = "  << SLOW" if run["flagged"] else ""
+    if run["verified"] is False:
+        flag += "  << VERIFY FAILED"
+    if run["status"] == "failed":
+        flag += f"  << FAILED: {run['error']}"
+    return (
+        f"{started}  {run['database']:<20} {run['inserted']:>10} rows  "
+        f"{run['bytes'] / 1048576:>8.1f} MB  {run['seconds']:>8.1f}s  "
+        f"{run['rows_per_sec']:>8.0f} rows/s{flag}"
+    )
+
+
+def main():
+    database = sys.argv[1] if len(sys.argv) > 1 else None
+    runs = trends(database)
+
+    if not runs:
+        print(f"No runs recorded in {HISTORY_DB}")
+        return
+
+    for run in runs:
+        print(format_run(run))
+
+
+if __name__ == "__main__":
+    main()
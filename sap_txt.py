@@ -0,0 +1,81 @@
+import codecs
+import re
+from pathlib import Path
+
+# ==============================
+# CONFIG
+# ==============================
+SNIFF_BYTES = 64 * 1024
+READ_BUFFER = 1024 * 1024
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+# ==============================
+# ENCODING DETECTION
+# ==============================
+def detect_encoding(txt_file: Path, sample_size: int = SNIFF_BYTES) -> str:
+    """Guess the codec of a SAP TXT export from its first few KB.
+
+    SAP GUI downloads arrive as UTF-8, UTF-16LE with a BOM, or cp1252
+    depending on the user's settings. The returned name is meant to be
+    passed straight to open() so the C codec does the decoding.
+
+    Pure ASCII fits both UTF-8 and cp1252, so when the first few KB are
+    ASCII the file is read on to its first non-ASCII byte and the choice
+    is made there.
+    """
+    with open(txt_file, "rb") as f:
+        sample = f.read(sample_size)
+
+        for bom, encoding in BOMS:
+            if sample.startswith(bom):
+                return encoding
+
+        # UTF-16 without a BOM: every other byte of ASCII text is NUL
+        if len(sample) >= 4:
+            if sample[1::2].count(0) > len(sample) // 4 and not sample[0::2].count(0):
+                return "utf-16-le"
+            if sample[0::2].count(0) > len(sample) // 4 and not sample[1::2].count(0):
+                return "utf-16-be"
+
+        if sample.isascii():
+            offset = len(sample)
+            while True:
+                chunk = f.read(READ_BUFFER)
+                if not chunk:
+                    return "utf-8"
+                match = NON_ASCII.search(chunk)
+                if match:
+                    # everything before is ASCII, so this is a character boundary
+                    f.seek(offset + match.start())
+                    sample = f.read(sample_size)
+                    break
+                offset += len(chunk)
+
+    # final=False so a multi-byte char cut off at the end of the sample is fine
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        # cp1252 leaves 5 bytes undefined, latin-1 maps every byte
+        return "latin-1"
+
+
+def open_txt(txt_file: Path, encoding: str = None):
+    """Open a SAP TXT export for csv.reader with the detected encoding."""
+    if encoding is None:
+        encoding = detect_encoding(txt_file)
+    return open(txt_file, newline="", encoding=encoding, buffering=READ_BUFFER)
@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+
+from compact import compact_database
+
+
+def make_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO t (payload) VALUES (?)", [("x" * 500,)] * rows)
+    conn.commit()
+    return conn
+
+
+def test_compact_sqlite_shrinks_emptied_database(tmp_path):
+    db_path = tmp_path / "MARA.sqlite3"
+    conn = make_db(db_path, 5000)
+    conn.execute("DELETE FROM t WHERE id > 10")
+    conn.commit()
+    conn.close()
+
+    messages = []
+    before, after = compact_database(db_path, messages.append)
+
+    assert after < before
+    assert db_path.stat().st_size == after
+    assert messages and messages[0].startswith("  Compacted:")
+    assert not (tmp_path / "~compact_MARA.sqlite3").exists()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 10
+    conn.close()
+
+
+def test_compact_replaces_stale_temp_file(tmp_path):
+    db_path = tmp_path / "MARC.db"
+    make_db(db_path, 10).close()
+    (tmp_path / "~compact_MARC.db").write_bytes(b"left over from a killed run")
+
+    compact_database(db_path, lambda message: None)
+
+    assert not (tmp_path / "~compact_MARC.db").exists()
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 10
+    conn.close()
+
+
+def test_compact_rejects_unknown_file_type(tmp_path):
+    path = tmp_path / "MBEW.txt"
+    path.write_text("not a database")
+
+    with pytest.raises(ValueError):
+        compact_database(path, lambda message: None)
@@ -0,0 +1,143 @@
+from decimal import Decimal, InvalidOperation
+
+# ==============================
+# CONFIG
+# ==============================
+EXACT_TYPES = (int, Decimal)  # Long, Integer, Byte, Currency, Decimal
+SUM_TOLERANCE = Decimal("0.0001")  # rounding slack for exact sums
+FLOAT_TOLERANCE = Decimal("1e-7")  # Single rounds each value by up to 6e-8 of it
+
+
+# ==============================
+# LOAD CHECKSUM
+# ==============================
+class LoadChecksum:
+    """Order-independent checksum over the rows sent to one table.
+
+    Per column it keeps the non-NULL count, plus the total text length for
+    text columns or the numeric sum for number columns. The same figures
+    come back from a single aggregate query, so a load is verified by
+    querying the table once before and once after the insert.
+
+    Single and Double columns store a rounded copy of the file value, so
+    their sums are compared with a tolerance relative to the magnitudes
+    involved rather than the fixed SUM_TOLERANCE.
+    """
+
+    def __init__(self, description):
+        self.columns = [col[0] for col in description]
+        self.kinds = []
+        for col in description:
+            if col[1] is str:
+                self.kinds.append("text")
+            elif col[1] in EXACT_TYPES:
+                self.kinds.append("number")
+            elif col[1] is float:
+                self.kinds.append("float")
+            else:
+                self.kinds.append("other")
+
+        self.before = None
+        self.rows = 0
+        self.counts = [0] * len(self.columns)
+        self.totals = [0] * len(self.columns)
+        self.magnitudes = [0] * len(self.columns)
+
+    def add(self, row):
+        self.rows += 1
+        for i, value in enumerate(row):
+            if value is None:
+                continue
+            self.counts[i] += 1
+            kind = self.kinds[i]
+            if kind == "text":
+                self.totals[i] += len(value)
+            elif kind in ("number", "float") and self.totals[i] is not None:
+                try:
+                    number = Decimal(value)
+                    self.totals[i] += number
+                    self.magnitudes[i] += abs(number)
+                except InvalidOperation:
+                    # the driver converted it some other way, can't compare
+                    self.totals[i] = None
+
+    def aggregate_sql(self, table):
+        parts = ["COUNT(*)"]
+        for name, kind in zip(self.columns, self.kinds):
+            parts.append(f"COUNT([{name}])")
+            if kind == "text":
+                parts.append(f"SUM(LEN([{name}]))")
+            elif kind in ("number", "float"):
+                parts.append(f"SUM([{name}])")
+        return f"SELECT {', '.join(parts)} FROM [{table}]"
+
+    def snapshot(self, cursor, table):
+        """Return (row_count, [(count, total), ...]) for the table as it is now."""
+        values = list(cursor.execute(self.aggregate_sql(table)).fetchone())
+        row_count = values.pop(0)
+
+        columns = []
+        for kind in self.kinds:
+            count = values.pop(0)
+            total = values.pop(0) if kind != "other" else 0
+            columns.append((count, total or 0))
+        return row_count, columns
+
+    def compare(self, before, after, rows_only=False):
+        """Return a list of mismatch messages, empty if the load checks out.
+
+        rows_only skips the column checks, for loads that also updated
+        existing rows and so changed their totals.
+        """
+        problems = []
+
+        added = after[0] - before[0]
+        if added != self.rows:
+            problems.append(f"row count: expected +{self.rows}, table +{added}")
+
+        if rows_only:
+            return problems
+
+        for i, name in enumerate(self.columns):
+            count = after[1][i][0] - before[1][i][0]
+            if count != self.counts[i]:
+                problems.append(f"[{name}] non-null: expected {self.counts[i]}, got {count}")
+                continue
+
+            if self.kinds[i] == "other" or self.totals[i] is None:
+                continue
+
+            before_total = Decimal(str(before[1][i][1]))
+            total = Decimal(str(after[1][i][1])) - before_total
+
+            tolerance = SUM_TOLERANCE
+            if self.kinds[i] == "float":
+                # each stored value is rounded, and the table total is
+                # summed in floating point before and after the load
+                scale = self.magnitudes[i] + abs(before_total)
+                tolerance = max(tolerance, scale * FLOAT_TOLERANCE)
+
+            if abs(total - Decimal(self.totals[i])) > tolerance:
+                problems.append(f"[{name}] checksum: expected {self.totals[i]}, got {total}")
+
+        return problems
+
+
+    def begin(self, cursor, table):
+        """Take the "before" snapshot, ahead of the first insert."""
+        self.before = self.snapshot(cursor, table)
+
+    def finish(self, cursor, table, log, rows_only=False):
+        """Check the committed table against begin() and log the outcome.
+
+        Returns the problems found, empty if the load checks out.
+        """
+        after = self.snapshot(cursor, table)
+        problems = self.compare(self.before, after, rows_only)
+        if problems:
+            log("  VERIFY FAILED:")
+            for problem in problems:
+                log(f"    {problem}")
+        else:
+            log(f"  Verified: +{after[0] - self.before[0]} rows, checksums match")
+        return problems